@@ -12,23 +12,63 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import os
 import pathlib
 import shutil
+import subprocess
 
 import nox
 
 CURRENT_DIRECTORY = pathlib.Path(__file__).parent.absolute()
 
+# Reuse each session's virtualenv between runs so re-runs skip dependency
+# resolution and wheel builds entirely. Pass --no-reuse-existing-virtualenvs
+# to force a clean environment. CI can get the same effect across machines
+# by caching the .nox/ and .nox-pip-cache/ directories keyed on
+# hashFiles('testing/constraints-*.txt', 'setup.py').
+nox.options.reuse_existing_virtualenvs = True
+
+# Point pip at a persistent wheel cache so sessions that do rebuild their
+# virtualenv still reuse downloaded and locally-built wheels (grpcio,
+# cryptography and aiohttp builds dominate a cold install).
+PIP_CACHE_ARGS = [
+    "--cache-dir",
+    os.environ.get("PIP_CACHE_DIR", str(CURRENT_DIRECTORY / ".nox-pip-cache")),
+]
+
+UNIT_PYTHON_VERSIONS = ["3.6", "3.7", "3.8", "3.9"]
+
+
+def _install(session, *args):
+    """Install packages into the session's virtualenv, using uv if available.
+
+    uv resolves requirements with a compiled resolver and shares wheels
+    across environments through a hard-link based global cache, which makes
+    the install prelude of the four-Python unit matrix dramatically cheaper.
+    Falls back to pip via session.install when uv is not on PATH.
+    """
+    if shutil.which("uv"):
+        session.run_always(
+            "uv",
+            "pip",
+            "install",
+            *args,
+            env={"VIRTUAL_ENV": session.virtualenv.location},
+            external=True,
+        )
+    else:
+        session.install(*args)
+
+
 TEST_DEPENDENCIES = [
     "flask",
     "freezegun",
     "mock",
-    "oauth2client",
     "pyopenssl",
     "pytest",
-    "pytest-cov",
     "pytest-localserver",
+    "pytest-xdist",
     "pyu2f",
     "requests",
     "urllib3",
@@ -44,6 +84,30 @@ ASYNC_DEPENDENCIES = [
     "aiohttp!=3.7.4.post0",
 ]
 
+# Coverage measurement installs a sys.settrace hook that roughly halves
+# pure-Python execution speed, so only the sessions that actually report
+# coverage (cover, pypy) install and enable it; unit runs at full speed.
+COV_DEPENDENCIES = ["pytest-cov"]
+
+# oauth2client is deprecated and drags httplib2/six/pyasn1 into every venv,
+# so only the interop session (and the full-coverage sessions, which run
+# the marked tests too) installs it.
+INTEROP_TEST_DEPENDENCIES = ["oauth2client"]
+
+# Each profile gets its own fully-pinned lockfile so sessions only install
+# the dependency set they actually use; a single combined lockfile would
+# hand oauth2client and pytest-cov right back to the unit session.
+LOCK_PROFILES = {
+    "unit": TEST_DEPENDENCIES + ASYNC_DEPENDENCIES,
+    "interop": TEST_DEPENDENCIES + ASYNC_DEPENDENCIES + INTEROP_TEST_DEPENDENCIES,
+    "cover": (
+        TEST_DEPENDENCIES
+        + ASYNC_DEPENDENCIES
+        + COV_DEPENDENCIES
+        + INTEROP_TEST_DEPENDENCIES
+    ),
+}
+
 BLACK_VERSION = "black==19.3b0"
 BLACK_PATHS = [
     "google",
@@ -55,22 +119,32 @@ BLACK_PATHS = [
 ]
 
 
+def _install_cached_tools(session, *tools):
+    """Install pinned tools only when they differ from the reused venv.
+
+    Records the requested tool set in a key file inside the session's
+    virtualenv; while the key matches, reuse the environment as-is and
+    skip the install entirely. Only suitable for sessions whose tools are
+    pinned or change rarely (lint, blacken).
+    """
+    key = "\n".join(tools)
+    key_file = pathlib.Path(session.virtualenv.location) / "tool-versions.txt"
+    if key_file.exists() and key_file.read_text() == key:
+        session.log("tool versions unchanged, skipping install")
+        return
+    _install(session, *PIP_CACHE_ARGS, *tools)
+    key_file.write_text(key)
+
+
 @nox.session(python="3.7")
 def lint(session):
-    session.install("flake8", "flake8-import-order", "docutils", BLACK_VERSION)
-    session.install("-e", ".")
-    session.run("black", "--check", *BLACK_PATHS)
-    session.run(
-        "flake8",
-        "--import-order-style=google",
-        "--application-import-names=google,tests,system_tests",
-        "google",
-        "tests",
-        "tests_async",
-    )
-    session.run(
-        "python", "setup.py", "check", "--metadata", "--restructuredtext", "--strict"
-    )
+    # All the checks (black, flake8, setup.py check) run as pre-commit
+    # hooks, which caches each tool's environment between runs and runs
+    # independent hooks in parallel. See .pre-commit-config.yaml. The lint
+    # tools only read the source tree, so the package itself is not
+    # installed here.
+    _install_cached_tools(session, "pre-commit")
+    session.run("pre-commit", "run", "--all-files", "--show-diff-on-failure")
 
 
 @nox.session(python="3.8")
@@ -82,56 +156,257 @@ def blacken(session):
 
     https://github.com/googleapis/synthtool/blob/master/docker/owlbot/python/Dockerfile
     """
-    session.install(BLACK_VERSION)
+    _install_cached_tools(session, BLACK_VERSION)
     session.run("black", *BLACK_PATHS)
 
 
-@nox.session(python=["3.6", "3.7", "3.8", "3.9"])
-def unit(session):
+def _package_wheel(session):
+    """Return the path to the library wheel, rebuilding it when stale.
+
+    Installing a prebuilt wheel avoids re-running setup.py for every
+    session; the wheel built once in dist/ is shared across all four unit
+    matrix versions (it is pure-Python). The wheel is rebuilt whenever a
+    library source or packaging file is newer than the cached build.
+    """
+    dist_dir = CURRENT_DIRECTORY / "dist"
+    wheels = list(dist_dir.glob("google_auth-*.whl"))
+    newest_wheel = max((os.path.getmtime(path) for path in wheels), default=0.0)
+    sources = [
+        CURRENT_DIRECTORY / "setup.py",
+        CURRENT_DIRECTORY / "pyproject.toml",
+        *(CURRENT_DIRECTORY / "google").rglob("*.py"),
+    ]
+    if any(os.path.getmtime(path) > newest_wheel for path in sources):
+        _install(session, *PIP_CACHE_ARGS, "build")
+        session.run("python", "-m", "build", "--wheel", "--outdir", str(dist_dir))
+        wheels = list(dist_dir.glob("google_auth-*.whl"))
+    return str(max(wheels, key=os.path.getmtime))
+
+
+def _lock_path(python_version, profile):
+    return (
+        CURRENT_DIRECTORY
+        / "testing"
+        / "constraints-lock-{}-{}.txt".format(python_version, profile)
+    )
+
+
+def _lock_profile(coverage, interop):
+    if coverage:
+        return "cover"
+    if interop:
+        return "interop"
+    return "unit"
+
+
+def _install_test_deps(session, constraints_path=None, coverage=False, interop=False):
+    """Install the test dependency set and the library wheel.
+
+    When a fully-pinned lockfile exists for this session's Python (see the
+    lock session), everything installs with --no-deps and no dependency
+    resolution at all. Otherwise fall back to resolving the dependency
+    lists, optionally under a constraints file.
+    """
+    wheel = _package_wheel(session)
+    lock_path = _lock_path(session.python, _lock_profile(coverage, interop))
+    if lock_path.exists():
+        _install(session, *PIP_CACHE_ARGS, "--no-deps", "-r", str(lock_path))
+    else:
+        args = [*TEST_DEPENDENCIES, *ASYNC_DEPENDENCIES, wheel]
+        if coverage:
+            args += COV_DEPENDENCIES
+        if interop:
+            args += INTEROP_TEST_DEPENDENCIES
+        if constraints_path:
+            args += ["-c", constraints_path]
+        _install(session, *PIP_CACHE_ARGS, *args)
+    # pip skips a wheel whose name and version are already installed, so in
+    # a reused virtualenv the wheel must be force-reinstalled to guarantee
+    # the session runs the code in the working tree.
+    _install(session, *PIP_CACHE_ARGS, "--force-reinstall", "--no-deps", wheel)
+
+
+@nox.session(python=UNIT_PYTHON_VERSIONS)
+def lock(session):
+    """Regenerate the pinned test-dependency lockfiles for this Python.
+
+    The unit, interop, cover and pypy sessions install the lockfile for
+    their profile with --no-deps, skipping pip's resolver entirely. Re-run
+    this session after changing the dependency lists in this file or the
+    constraints files.
+    """
+    _install(session, *PIP_CACHE_ARGS, "pip-tools")
     constraints_path = str(
         CURRENT_DIRECTORY / "testing" / f"constraints-{session.python}.txt"
     )
-    add_constraints = ["-c", constraints_path]
-    session.install(*(TEST_DEPENDENCIES + add_constraints))
-    session.install(*(ASYNC_DEPENDENCIES + add_constraints))
-    session.install("-e", ".", *add_constraints)
-    session.run(
-        "pytest",
-        f"--junitxml=unit_{session.python}_sponge_log.xml",
-        "--cov=google.auth",
-        "--cov=google.oauth2",
-        "--cov=tests",
-        "--cov-report=term-missing",
-        "tests",
-        "tests_async",
+    for profile, dependencies in LOCK_PROFILES.items():
+        deps_file = CURRENT_DIRECTORY / "testing" / "test-deps-{}.in".format(profile)
+        deps_file.write_text("\n".join(dependencies) + "\n")
+        session.run(
+            "pip-compile",
+            "--generate-hashes",
+            "--constraint",
+            constraints_path,
+            "--output-file",
+            str(_lock_path(session.python, profile)),
+            str(deps_file),
+            str(CURRENT_DIRECTORY / "setup.py"),
+        )
+
+
+def _run_suites_concurrently(session, pytest_args_for_suite, coverage=False):
+    """Run the sync and async test suites in two concurrent pytest processes.
+
+    The tests and tests_async directories share no fixtures, so they can run
+    side by side instead of back-to-back in one pytest process. When coverage
+    is measured, each process writes its data to a distinct COVERAGE_FILE and
+    the data files are combined once both suites finish.
+    """
+
+    def run_suite(suite):
+        env = {"COVERAGE_FILE": ".coverage.{}".format(suite)} if coverage else None
+        session.run("pytest", *pytest_args_for_suite(suite), suite, env=env)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        suite_futures = [
+            executor.submit(run_suite, suite) for suite in ("tests", "tests_async")
+        ]
+        for future in suite_futures:
+            future.result()
+
+    if coverage:
+        session.run("coverage", "combine")
+
+
+@nox.session(python=UNIT_PYTHON_VERSIONS)
+def unit(session):
+    constraints_path = str(
+        CURRENT_DIRECTORY / "testing" / f"constraints-{session.python}.txt"
     )
+    _install_test_deps(session, constraints_path)
+
+    def pytest_args(suite):
+        return [
+            # Run tests in parallel, keeping tests from the same file on
+            # the same worker. Failed-first still runs the whole suite but
+            # surfaces previously failing tests immediately on reruns.
+            "-n",
+            "auto",
+            "--dist=loadfile",
+            "--ff",
+            "-m",
+            "not oauth2client_interop",
+            f"--junitxml=unit_{session.python}_{suite}_sponge_log.xml",
+        ]
+
+    # Coverage is the cover session's job; skipping the tracer here keeps
+    # the iteration loop at full interpreter speed.
+    _run_suites_concurrently(session, pytest_args)
+
+
+@nox.session(python="3.8")
+def build_wheel(session):
+    """Build (or refresh) the shared library wheel in dist/."""
+    _package_wheel(session)
+
+
+@nox.session(python=False)
+def unit_all(session):
+    """Run every unit session's Python version concurrently.
+
+    nox runs a session matrix sequentially, so the wall time of ``nox -s
+    unit`` is the sum of the four interpreter runs. This driver fans each
+    version out to its own ``nox -s unit-X.Y`` subprocess and waits for all
+    of them, so the wall time is roughly the slowest single version. Each
+    subprocess's output is written to ``unit_X.Y.log`` in the repo root to
+    keep the interleaved output readable.
+    """
+    # Build the shared wheel serially before fanning out; on a cold dist/
+    # the four subprocesses would otherwise race concurrent builds and can
+    # glob partially-written wheels.
+    session.run("nox", "-s", "build_wheel", external=True)
+
+    def run_version(version):
+        log_path = CURRENT_DIRECTORY / "unit_{}.log".format(version)
+        with open(log_path, "w") as log_file:
+            return subprocess.run(
+                ["nox", "-s", "unit-{}".format(version)],
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(UNIT_PYTHON_VERSIONS)
+    ) as executor:
+        results = list(executor.map(run_version, UNIT_PYTHON_VERSIONS))
+
+    failed = [
+        version
+        for version, result in zip(UNIT_PYTHON_VERSIONS, results)
+        if result.returncode != 0
+    ]
+    if failed:
+        session.error(
+            "unit sessions failed for Python {} (see unit_*.log)".format(
+                ", ".join(failed)
+            )
+        )
 
 
 @nox.session(python="3.7")
 def cover(session):
-    session.install(*TEST_DEPENDENCIES)
-    session.install(*(ASYNC_DEPENDENCIES))
-    session.install("-e", ".")
-    session.run(
-        "pytest",
-        "--cov=google.auth",
-        "--cov=google.oauth2",
-        "--cov=tests",
-        "--cov=tests_async",
-        "--cov-report=term-missing",
-        "tests",
-        "tests_async",
-    )
+    _install_test_deps(session, coverage=True, interop=True)
+
+    def pytest_args(suite):
+        return [
+            "--cov=google.auth",
+            "--cov=google.oauth2",
+            "--cov=tests",
+            "--cov=tests_async",
+            "--cov-report=",
+        ]
+
+    _run_suites_concurrently(session, pytest_args, coverage=True)
     session.run("coverage", "report", "--show-missing", "--fail-under=100")
 
 
+@nox.session(python="3.7")
+def interop(session):
+    """Run the oauth2client interop tests.
+
+    These are excluded from the unit session so the deprecated
+    oauth2client (and its httplib2/six/pyasn1 dependency tree) stays out
+    of the hot-path virtualenvs.
+    """
+    _install_test_deps(session, interop=True)
+    session.run("pytest", "-m", "oauth2client_interop", "tests")
+
+
+def _apidoc_is_stale():
+    """Return True if docs/reference is missing or older than the sources."""
+    reference_dir = CURRENT_DIRECTORY / "docs" / "reference"
+    if not reference_dir.exists():
+        return True
+    newest_source = max(
+        path.stat().st_mtime for path in (CURRENT_DIRECTORY / "google").rglob("*.py")
+    )
+    # default covers an empty reference dir (e.g. an interrupted
+    # sphinx-apidoc run), which counts as stale.
+    newest_generated = max(
+        (path.stat().st_mtime for path in reference_dir.rglob("*.rst")), default=0.0
+    )
+    return newest_source > newest_generated
+
+
 @nox.session(python="3.7")
 def docgen(session):
     session.env["SPHINX_APIDOC_OPTIONS"] = "members,inherited-members,show-inheritance"
-    session.install(*TEST_DEPENDENCIES)
-    session.install("sphinx")
-    session.install("-e", ".")
-    session.run("rm", "-r", "docs/reference")
+    _install(session, *PIP_CACHE_ARGS, *TEST_DEPENDENCIES, "sphinx", "-e", ".")
+    # Only regenerate the apidoc stubs when a source module changed since the
+    # last run; use the docs_clean session to force a full rebuild.
+    if not _apidoc_is_stale():
+        session.log("docs/reference is up to date, skipping sphinx-apidoc")
+        return
     session.run(
         "sphinx-apidoc",
         "--output-dir",
@@ -146,17 +421,26 @@ def docgen(session):
 def docs(session):
     """Build the docs for this library."""
 
-    session.install("-e", ".[aiohttp]")
-    session.install(
-        "sphinx<3.0.0", "alabaster", "recommonmark", "sphinx-docstring-typing"
+    _install(
+        session,
+        *PIP_CACHE_ARGS,
+        "sphinx<3.0.0",
+        "alabaster",
+        "recommonmark",
+        "sphinx-docstring-typing",
+        "-e",
+        ".[aiohttp]",
     )
 
-    shutil.rmtree(os.path.join("docs", "_build"), ignore_errors=True)
+    # Keep docs/_build between runs so Sphinx only rebuilds pages whose
+    # sources changed; -W still fails the build loudly on stale content.
     session.run(
         "sphinx-build",
         "-T",  # show full traceback on exception
         "-W",  # warnings as errors
         "-N",  # no colors
+        "-j",  # build in parallel
+        "auto",
         "-b",
         "html",
         "-d",
@@ -166,17 +450,31 @@ def docs(session):
     )
 
 
+@nox.session(python=False)
+def docs_clean(session):
+    """Remove the Sphinx build cache and generated apidoc stubs.
+
+    Run this before docs or docgen to force a full rebuild.
+    """
+    shutil.rmtree(os.path.join("docs", "_build"), ignore_errors=True)
+    shutil.rmtree(os.path.join("docs", "reference"), ignore_errors=True)
+
+
 @nox.session(python="pypy")
 def pypy(session):
-    session.install(*TEST_DEPENDENCIES)
-    session.install(*ASYNC_DEPENDENCIES)
-    session.install("-e", ".")
-    session.run(
-        "pytest",
-        f"--junitxml=unit_{session.python}_sponge_log.xml",
-        "--cov=google.auth",
-        "--cov=google.oauth2",
-        "--cov=tests",
-        "tests",
-        "tests_async",
-    )
+    _install_test_deps(session, coverage=True, interop=True)
+
+    def pytest_args(suite):
+        return [
+            "-n",
+            "auto",
+            "--dist=loadfile",
+            f"--junitxml=unit_{session.python}_{suite}_sponge_log.xml",
+            "--cov=google.auth",
+            "--cov=google.oauth2",
+            "--cov=tests",
+            "--cov-report=",
+        ]
+
+    _run_suites_concurrently(session, pytest_args, coverage=True)
+    session.run("coverage", "report", "--show-missing")
@@ -12,16 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ast
 import io
 import os
+import sys
 
 from setuptools import find_packages
 from setuptools import setup
 
 
+# Metadata stays in setup.py rather than a PEP 621 [project] table because
+# PEP 621 support starts with setuptools 61, which requires Python >= 3.7,
+# and this library still supports (and builds on) Python 3.6.
 DEPENDENCIES = (
     "cachetools >= 2.0.0, < 5.0",
-    "pyasn1-modules >= 0.2.1",
+    "pyasn1-modules >= 0.2.1, < 1.0",
     "rsa >= 3.1.4, < 5",
     "setuptools >= 40.3.0",
 )
@@ -32,15 +37,28 @@ extras = {
     "reauth": "pyu2f >= 0.1.5",
 }
 
-with io.open("README.rst", "r") as fh:
-    long_description = fh.read()
+# Only the distribution-building and metadata-generating commands consume
+# long_description (dist_info is how PEP 517 frontends prepare wheel
+# metadata); skip the README read on fast paths like develop and egg_info
+# (every editable install in CI runs through here).
+long_description = None
+if {"sdist", "bdist_wheel", "dist_info", "check"}.intersection(sys.argv):
+    with io.open("README.rst", "r") as fh:
+        long_description = fh.read()
 
 package_root = os.path.abspath(os.path.dirname(__file__))
 
-version = {}
+# Parse the version out of version.py statically rather than exec()-ing
+# the module, so no code runs while building the metadata.
 with open(os.path.join(package_root, "google/auth/version.py")) as fp:
-    exec(fp.read(), version)
-version = version["__version__"]
+    version_module = ast.parse(fp.read())
+version = next(
+    node.value.s
+    for node in version_module.body
+    if isinstance(node, ast.Assign)
+    and isinstance(node.targets[0], ast.Name)
+    and node.targets[0].id == "__version__"
+)
 
 setup(
     name="google-auth",
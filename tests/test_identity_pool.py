@@ -13,9 +13,13 @@
 # limitations under the License.
 
 import datetime
+import functools
 import http.client
+import itertools
 import json
 import os
+import re
+import sys
 import urllib
 
 import mock
@@ -24,7 +28,6 @@ import pytest
 from google.auth import _helpers
 from google.auth import exceptions
 from google.auth import identity_pool
-from google.auth import transport
 
 
 CLIENT_ID = "username"
@@ -41,32 +44,164 @@ SCOPES = ["scope1", "scope2"]
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 SUBJECT_TOKEN_TEXT_FILE = os.path.join(DATA_DIR, "external_subject_token.txt")
 SUBJECT_TOKEN_JSON_FILE = os.path.join(DATA_DIR, "external_subject_token.json")
-SUBJECT_TOKEN_FIELD_NAME = "access_token"
+# Interned so the many dict lookups and comparisons keyed on these
+# constants hit CPython's pointer-equality fast path.
+SUBJECT_TOKEN_FIELD_NAME = sys.intern("access_token")
 
-with open(SUBJECT_TOKEN_TEXT_FILE) as fh:
-    TEXT_FILE_SUBJECT_TOKEN = fh.read()
 
-with open(SUBJECT_TOKEN_JSON_FILE) as fh:
-    JSON_FILE_CONTENT = json.load(fh)
-    JSON_FILE_SUBJECT_TOKEN = JSON_FILE_CONTENT.get(SUBJECT_TOKEN_FIELD_NAME)
+# The data files are read lazily (and in binary mode, skipping the
+# text-mode decoder) so collecting this module for symbol access doesn't
+# pay the disk and JSON parse cost; the cache makes the read a one-time
+# cost per run.
+@functools.lru_cache(maxsize=None)
+def _text_file_subject_token():
+    with open(SUBJECT_TOKEN_TEXT_FILE, "rb") as fh:
+        return fh.read().decode("utf-8")
 
-TOKEN_URL = "https://sts.googleapis.com/v1/token"
-SUBJECT_TOKEN_TYPE = "urn:ietf:params:oauth:token-type:jwt"
-AUDIENCE = "//iam.googleapis.com/projects/123456/locations/global/workloadIdentityPools/POOL_ID/providers/PROVIDER_ID"
+
+@functools.lru_cache(maxsize=None)
+def _json_file_content():
+    with open(SUBJECT_TOKEN_JSON_FILE, "rb") as fh:
+        return json.loads(fh.read())
+
+
+def _json_file_subject_token():
+    return _json_file_content().get(SUBJECT_TOKEN_FIELD_NAME)
+
+
+# The same response dicts (SUCCESS_RESPONSE, the JSON file content, the
+# impersonation response) are serialized into mock response bodies over
+# and over; caching on the dict's items makes each distinct payload a
+# one-time json.dumps cost.
+@functools.lru_cache(maxsize=None)
+def _serialized_response(data_items):
+    return json.dumps(dict(data_items)).encode("utf-8")
+
+
+class _FakeResponse(object):
+    """Stand-in for transport.Response.
+
+    mock.create_autospec introspects the whole class on every call; the
+    tests only ever read ``status`` and ``data``, so a slotted dummy is
+    much cheaper to construct.
+    """
+
+    __slots__ = ("status", "data")
+
+
+# Expected error messages, precompiled once instead of per excinfo.match
+# call; re's own pattern cache is bounded and shared with the library code
+# under test.
+_MISSING_CREDENTIAL_SOURCE_PATTERN = re.compile(r"Missing credential_source")
+_AMBIGUOUS_CREDENTIAL_SOURCE_PATTERN = re.compile(r"Ambiguous credential_source")
+_INVALID_ENVIRONMENT_ID_PATTERN = re.compile(
+    r"Invalid Identity Pool credential_source field 'environment_id'"
+)
+_INVALID_FORMAT_TYPE_PATTERN = re.compile(r"Invalid credential_source format 'xml'")
+_MISSING_FIELD_NAME_PATTERN = re.compile(
+    r"Missing subject_token_field_name for JSON credential_source format"
+)
+_MISSING_SUBJECT_TOKEN_PATTERN = re.compile(
+    r"Missing subject_token in the credential_source file"
+)
+_FILE_NOT_FOUND_PATTERN = re.compile(r"File './not_found.txt' was not found")
+_RETRIEVAL_ERROR_PATTERN = re.compile(r"Unable to retrieve Identity Pool subject token")
+
+
+def _unparseable_subject_token_pattern(source, field_name):
+    # The interpolated source is a path or URL with regex metacharacters,
+    # so the full message has to be escaped before compiling.
+    return re.compile(
+        re.escape(
+            "Unable to parse subject_token from JSON file '{}' using key '{}'".format(
+                source, field_name
+            )
+        )
+    )
+
+
+_JSON_FILE_MISSING_KEY_PATTERN = _unparseable_subject_token_pattern(
+    SUBJECT_TOKEN_JSON_FILE, "not_found"
+)
+
+TOKEN_URL = sys.intern("https://sts.googleapis.com/v1/token")
+SUBJECT_TOKEN_TYPE = sys.intern("urn:ietf:params:oauth:token-type:jwt")
+AUDIENCE = sys.intern(
+    "//iam.googleapis.com/projects/123456/locations/global/workloadIdentityPools/POOL_ID/providers/PROVIDER_ID"
+)
+
+# The JSON credential source format block is read-only everywhere it is
+# used, so a single shared dict serves every source. (A MappingProxyType
+# would be stricter, but external_account's info property deepcopies the
+# credential source and deepcopy rejects mapping proxies.)
+JSON_FORMAT = {"type": "json", "subject_token_field_name": SUBJECT_TOKEN_FIELD_NAME}
+
+
+def _freeze(value):
+    """Recursively converts dicts and lists into hashable cache keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+@pytest.fixture(scope="class")
+def credentials_factory():
+    """Builder that memoizes Credentials per unique construction kwargs.
+
+    Several tests construct identical Credentials objects; sharing them is
+    safe because refresh only updates token state on the instance.
+    """
+    cache = {}
+
+    def _factory(**kwargs):
+        key = _freeze(kwargs)
+        if key not in cache:
+            cache[key] = TestCredentials.make_credentials(**kwargs)
+        return cache[key]
+
+    return _factory
+
+
+@pytest.fixture(scope="session")
+def full_options_config_file(tmpdir_factory):
+    """Config file with all supported options, written once per session."""
+    info = {
+        "audience": AUDIENCE,
+        "subject_token_type": SUBJECT_TOKEN_TYPE,
+        "token_url": TOKEN_URL,
+        "service_account_impersonation_url": SERVICE_ACCOUNT_IMPERSONATION_URL,
+        "client_id": CLIENT_ID,
+        "client_secret": CLIENT_SECRET,
+        "quota_project_id": QUOTA_PROJECT_ID,
+        "credential_source": {"file": SUBJECT_TOKEN_TEXT_FILE},
+    }
+    config_file = tmpdir_factory.mktemp("config").join("config.json")
+    config_file.write(json.dumps(info))
+    return config_file
+
+
+@pytest.fixture(scope="session")
+def required_options_config_file(tmpdir_factory):
+    """Config file with only the required options, written once per session."""
+    info = {
+        "audience": AUDIENCE,
+        "subject_token_type": SUBJECT_TOKEN_TYPE,
+        "token_url": TOKEN_URL,
+        "credential_source": {"file": SUBJECT_TOKEN_TEXT_FILE},
+    }
+    config_file = tmpdir_factory.mktemp("config").join("config.json")
+    config_file.write(json.dumps(info))
+    return config_file
 
 
 class TestCredentials(object):
     CREDENTIAL_SOURCE_TEXT = {"file": SUBJECT_TOKEN_TEXT_FILE}
-    CREDENTIAL_SOURCE_JSON = {
-        "file": SUBJECT_TOKEN_JSON_FILE,
-        "format": {"type": "json", "subject_token_field_name": "access_token"},
-    }
+    CREDENTIAL_SOURCE_JSON = {"file": SUBJECT_TOKEN_JSON_FILE, "format": JSON_FORMAT}
     CREDENTIAL_URL = "http://fakeurl.com"
     CREDENTIAL_SOURCE_TEXT_URL = {"url": CREDENTIAL_URL}
-    CREDENTIAL_SOURCE_JSON_URL = {
-        "url": CREDENTIAL_URL,
-        "format": {"type": "json", "subject_token_field_name": "access_token"},
-    }
+    CREDENTIAL_SOURCE_JSON_URL = {"url": CREDENTIAL_URL, "format": JSON_FORMAT}
     SUCCESS_RESPONSE = {
         "access_token": "ACCESS_TOKEN",
         "issued_token_type": "urn:ietf:params:oauth:token-type:access_token",
@@ -74,37 +209,53 @@ class TestCredentials(object):
         "expires_in": 3600,
         "scope": " ".join(SCOPES),
     }
+    # Templates for the requests/responses that
+    # assert_underlying_credentials_refresh verifies. These are built once
+    # at class scope so each call only fills in the fields that vary.
+    TOKEN_REQUEST_TEMPLATE = {
+        "grant_type": "urn:ietf:params:oauth:grant-type:token-exchange",
+        "requested_token_type": "urn:ietf:params:oauth:token-type:access_token",
+    }
+    IMPERSONATION_EXPIRE_TIME = (
+        _helpers.utcnow().replace(microsecond=0) + datetime.timedelta(seconds=3600)
+    ).isoformat("T") + "Z"
+    IMPERSONATION_RESPONSE = {
+        "accessToken": "SA_ACCESS_TOKEN",
+        "expireTime": IMPERSONATION_EXPIRE_TIME,
+    }
+    IMPERSONATION_HEADERS = {
+        "Content-Type": "application/json",
+        "authorization": "Bearer {}".format(SUCCESS_RESPONSE["access_token"]),
+    }
+    URL_MISSING_KEY_PATTERN = _unparseable_subject_token_pattern(
+        CREDENTIAL_URL, "not_found"
+    )
+    URL_INVALID_CONTENT_PATTERN = _unparseable_subject_token_pattern(
+        CREDENTIAL_URL, SUBJECT_TOKEN_FIELD_NAME
+    )
 
     @classmethod
     def make_mock_response(cls, status, data):
-        response = mock.create_autospec(transport.Response, instance=True)
+        response = _FakeResponse()
         response.status = status
         if isinstance(data, dict):
-            response.data = json.dumps(data).encode("utf-8")
+            response.data = _serialized_response(tuple(sorted(data.items())))
         else:
             response.data = data
         return response
 
     @classmethod
     def make_mock_request(
-        cls, token_status=http.client.OK, token_data=None, *extra_requests
+        cls, token_status=http.client.OK, token_data=None, extra_pairs=()
     ):
-        responses = []
-        responses.append(cls.make_mock_response(token_status, token_data))
-
-        while len(extra_requests) > 0:
-            # If service account impersonation is requested, mock the expected response.
-            status, data, extra_requests = (
-                extra_requests[0],
-                extra_requests[1],
-                extra_requests[2:],
-            )
-            responses.append(cls.make_mock_response(status, data))
-
-        request = mock.create_autospec(transport.Request)
-        request.side_effect = responses
+        # extra_pairs holds the (status, data) responses that follow the
+        # first one, e.g. for a service account impersonation request.
+        responses = [cls.make_mock_response(token_status, token_data)]
+        responses.extend(
+            cls.make_mock_response(status, data) for status, data in extra_pairs
+        )
 
-        return request
+        return mock.Mock(side_effect=responses)
 
     @classmethod
     def assert_credential_request_kwargs(
@@ -123,10 +274,12 @@ class TestCredentials(object):
         assert request_kwargs["method"] == "POST"
         assert request_kwargs["headers"] == headers
         assert request_kwargs["body"] is not None
-        body_tuples = urllib.parse.parse_qsl(request_kwargs["body"])
-        assert len(body_tuples) == len(request_data.keys())
-        for (k, v) in body_tuples:
-            assert v.decode("utf-8") == request_data[k.decode("utf-8")]
+        # Compare the urlencoded pairs at the bytes level instead of
+        # percent-decoding every key/value; ordering is not significant.
+        expected_body = frozenset(
+            urllib.parse.urlencode(request_data).encode("utf-8").split(b"&")
+        )
+        assert frozenset(request_kwargs["body"].split(b"&")) == expected_body
 
     @classmethod
     def assert_impersonation_request_kwargs(
@@ -165,7 +318,7 @@ class TestCredentials(object):
         expected parameters.
         """
         # STS token exchange request/response.
-        token_response = cls.SUCCESS_RESPONSE.copy()
+        token_response = cls.SUCCESS_RESPONSE
         token_headers = {"Content-Type": "application/x-www-form-urlencoded"}
         if basic_auth_encoding:
             token_headers["Authorization"] = "Basic " + basic_auth_encoding
@@ -176,9 +329,8 @@ class TestCredentials(object):
             token_scopes = " ".join(used_scopes or [])
 
         token_request_data = {
-            "grant_type": "urn:ietf:params:oauth:grant-type:token-exchange",
+            **cls.TOKEN_REQUEST_TEMPLATE,
             "audience": audience,
-            "requested_token_type": "urn:ietf:params:oauth:token-type:access_token",
             "scope": token_scopes,
             "subject_token": subject_token,
             "subject_token_type": subject_token_type,
@@ -186,18 +338,8 @@ class TestCredentials(object):
 
         if service_account_impersonation_url:
             # Service account impersonation request/response.
-            expire_time = (
-                _helpers.utcnow().replace(microsecond=0)
-                + datetime.timedelta(seconds=3600)
-            ).isoformat("T") + "Z"
-            impersonation_response = {
-                "accessToken": "SA_ACCESS_TOKEN",
-                "expireTime": expire_time,
-            }
-            impersonation_headers = {
-                "Content-Type": "application/json",
-                "authorization": "Bearer {}".format(token_response["access_token"]),
-            }
+            impersonation_response = cls.IMPERSONATION_RESPONSE
+            impersonation_headers = cls.IMPERSONATION_HEADERS
             impersonation_request_data = {
                 "delegates": None,
                 "scope": used_scopes,
@@ -217,7 +359,10 @@ class TestCredentials(object):
             impersonation_request_index = len(requests)
             requests.append((http.client.OK, impersonation_response))
 
-        request = cls.make_mock_request(*[el for req in requests for el in req])
+        status, data = requests[0]
+        request = cls.make_mock_request(
+            token_status=status, token_data=data, extra_pairs=requests[1:]
+        )
 
         credentials.refresh(request)
 
@@ -324,20 +469,8 @@ class TestCredentials(object):
         )
 
     @mock.patch.object(identity_pool.Credentials, "__init__", return_value=None)
-    def test_from_file_full_options(self, mock_init, tmpdir):
-        info = {
-            "audience": AUDIENCE,
-            "subject_token_type": SUBJECT_TOKEN_TYPE,
-            "token_url": TOKEN_URL,
-            "service_account_impersonation_url": SERVICE_ACCOUNT_IMPERSONATION_URL,
-            "client_id": CLIENT_ID,
-            "client_secret": CLIENT_SECRET,
-            "quota_project_id": QUOTA_PROJECT_ID,
-            "credential_source": self.CREDENTIAL_SOURCE_TEXT,
-        }
-        config_file = tmpdir.join("config.json")
-        config_file.write(json.dumps(info))
-        credentials = identity_pool.Credentials.from_file(str(config_file))
+    def test_from_file_full_options(self, mock_init, full_options_config_file):
+        credentials = identity_pool.Credentials.from_file(str(full_options_config_file))
 
         # Confirm identity_pool.Credentials instantiated with expected attributes.
         assert isinstance(credentials, identity_pool.Credentials)
@@ -353,16 +486,12 @@ class TestCredentials(object):
         )
 
     @mock.patch.object(identity_pool.Credentials, "__init__", return_value=None)
-    def test_from_file_required_options_only(self, mock_init, tmpdir):
-        info = {
-            "audience": AUDIENCE,
-            "subject_token_type": SUBJECT_TOKEN_TYPE,
-            "token_url": TOKEN_URL,
-            "credential_source": self.CREDENTIAL_SOURCE_TEXT,
-        }
-        config_file = tmpdir.join("config.json")
-        config_file.write(json.dumps(info))
-        credentials = identity_pool.Credentials.from_file(str(config_file))
+    def test_from_file_required_options_only(
+        self, mock_init, required_options_config_file
+    ):
+        credentials = identity_pool.Credentials.from_file(
+            str(required_options_config_file)
+        )
 
         # Confirm identity_pool.Credentials instantiated with expected attributes.
         assert isinstance(credentials, identity_pool.Credentials)
@@ -377,65 +506,75 @@ class TestCredentials(object):
             quota_project_id=None,
         )
 
-    def test_constructor_invalid_options(self):
-        credential_source = {"unsupported": "value"}
-
-        with pytest.raises(ValueError) as excinfo:
-            self.make_credentials(credential_source=credential_source)
-
-        assert excinfo.match(r"Missing credential_source")
-
-    def test_constructor_invalid_options_url_and_file(self):
-        credential_source = {
-            "url": self.CREDENTIAL_URL,
-            "file": SUBJECT_TOKEN_TEXT_FILE,
-        }
-
-        with pytest.raises(ValueError) as excinfo:
-            self.make_credentials(credential_source=credential_source)
-
-        assert excinfo.match(r"Ambiguous credential_source")
-
-    def test_constructor_invalid_options_environment_id(self):
-        credential_source = {"url": self.CREDENTIAL_URL, "environment_id": "aws1"}
-
-        with pytest.raises(ValueError) as excinfo:
-            self.make_credentials(credential_source=credential_source)
-
-        assert excinfo.match(
-            r"Invalid Identity Pool credential_source field 'environment_id'"
-        )
-
-    def test_constructor_invalid_credential_source(self):
-        with pytest.raises(ValueError) as excinfo:
-            self.make_credentials(credential_source="non-dict")
-
-        assert excinfo.match(r"Missing credential_source")
-
-    def test_constructor_invalid_credential_source_format_type(self):
-        credential_source = {"format": {"type": "xml"}}
-
+    @pytest.mark.parametrize(
+        "credential_source,match",
+        [
+            pytest.param(
+                {"unsupported": "value"},
+                _MISSING_CREDENTIAL_SOURCE_PATTERN,
+                id="invalid_options",
+            ),
+            pytest.param(
+                {"url": CREDENTIAL_URL, "file": SUBJECT_TOKEN_TEXT_FILE},
+                _AMBIGUOUS_CREDENTIAL_SOURCE_PATTERN,
+                id="url_and_file",
+            ),
+            pytest.param(
+                {"url": CREDENTIAL_URL, "environment_id": "aws1"},
+                _INVALID_ENVIRONMENT_ID_PATTERN,
+                id="environment_id",
+            ),
+            pytest.param(
+                "non-dict", _MISSING_CREDENTIAL_SOURCE_PATTERN, id="non_dict_source"
+            ),
+            pytest.param(
+                {"format": {"type": "xml"}},
+                _INVALID_FORMAT_TYPE_PATTERN,
+                id="invalid_format_type",
+            ),
+            pytest.param(
+                {"format": {"type": "json"}},
+                _MISSING_FIELD_NAME_PATTERN,
+                id="missing_subject_token_field_name",
+            ),
+        ],
+    )
+    def test_constructor_invalid_credential_source(self, credential_source, match):
         with pytest.raises(ValueError) as excinfo:
             self.make_credentials(credential_source=credential_source)
 
-        assert excinfo.match(r"Invalid credential_source format 'xml'")
+        assert match.search(str(excinfo.value))
 
-    def test_constructor_missing_subject_token_field_name(self):
-        credential_source = {"format": {"type": "json"}}
-
-        with pytest.raises(ValueError) as excinfo:
-            self.make_credentials(credential_source=credential_source)
+    # The info tests only read the credentials, so one instance per
+    # credential source can be shared across the class.
+    @pytest.fixture(scope="class")
+    @classmethod
+    def text_url_credentials(cls):
+        return cls.make_credentials(credential_source=cls.CREDENTIAL_SOURCE_TEXT_URL)
 
-        assert excinfo.match(
-            r"Missing subject_token_field_name for JSON credential_source format"
-        )
+    @pytest.fixture(scope="class")
+    @classmethod
+    def json_url_credentials(cls):
+        return cls.make_credentials(credential_source=cls.CREDENTIAL_SOURCE_JSON_URL)
+
+    # Mock transports with deterministic payloads, built once per class;
+    # the tests using them only inspect the raised error message.
+    # side_effect is a callable rather than a one-shot list so the shared
+    # mock keeps answering however many times it is called.
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_request_json_content(cls):
+        response = cls.make_mock_response(http.client.OK, _json_file_content())
+        return mock.Mock(side_effect=lambda *args, **kwargs: response)
 
-    def test_info_with_file_credential_source(self):
-        credentials = self.make_credentials(
-            credential_source=self.CREDENTIAL_SOURCE_TEXT_URL.copy()
-        )
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_request_invalid_json(cls):
+        response = cls.make_mock_response(http.client.OK, "{")
+        return mock.Mock(side_effect=lambda *args, **kwargs: response)
 
-        assert credentials.info == {
+    def test_info_with_file_credential_source(self, text_url_credentials):
+        assert text_url_credentials.info == {
             "type": "external_account",
             "audience": AUDIENCE,
             "subject_token_type": SUBJECT_TOKEN_TYPE,
@@ -443,12 +582,8 @@ class TestCredentials(object):
             "credential_source": self.CREDENTIAL_SOURCE_TEXT_URL,
         }
 
-    def test_info_with_url_credential_source(self):
-        credentials = self.make_credentials(
-            credential_source=self.CREDENTIAL_SOURCE_JSON_URL.copy()
-        )
-
-        assert credentials.info == {
+    def test_info_with_url_credential_source(self, json_url_credentials):
+        assert json_url_credentials.info == {
             "type": "external_account",
             "audience": AUDIENCE,
             "subject_token_type": SUBJECT_TOKEN_TYPE,
@@ -466,7 +601,7 @@ class TestCredentials(object):
         with pytest.raises(exceptions.RefreshError) as excinfo:
             credentials.retrieve_subject_token(None)
 
-        assert excinfo.match(r"Missing subject_token in the credential_source file")
+        assert _MISSING_SUBJECT_TOKEN_PATTERN.search(str(excinfo.value))
 
     def test_retrieve_subject_token_text_file(self):
         credentials = self.make_credentials(
@@ -475,7 +610,7 @@ class TestCredentials(object):
 
         subject_token = credentials.retrieve_subject_token(None)
 
-        assert subject_token == TEXT_FILE_SUBJECT_TOKEN
+        assert subject_token == _text_file_subject_token()
 
     def test_retrieve_subject_token_json_file(self):
         credentials = self.make_credentials(
@@ -484,7 +619,7 @@ class TestCredentials(object):
 
         subject_token = credentials.retrieve_subject_token(None)
 
-        assert subject_token == JSON_FILE_SUBJECT_TOKEN
+        assert subject_token == _json_file_subject_token()
 
     def test_retrieve_subject_token_json_file_invalid_field_name(self):
         credential_source = {
@@ -496,11 +631,7 @@ class TestCredentials(object):
         with pytest.raises(exceptions.RefreshError) as excinfo:
             credentials.retrieve_subject_token(None)
 
-        assert excinfo.match(
-            "Unable to parse subject_token from JSON file '{}' using key '{}'".format(
-                SUBJECT_TOKEN_JSON_FILE, "not_found"
-            )
-        )
+        assert _JSON_FILE_MISSING_KEY_PATTERN.search(str(excinfo.value))
 
     def test_retrieve_subject_token_invalid_json(self, tmpdir):
         # Provide JSON file. This should result in JSON parsing error.
@@ -515,11 +646,9 @@ class TestCredentials(object):
         with pytest.raises(exceptions.RefreshError) as excinfo:
             credentials.retrieve_subject_token(None)
 
-        assert excinfo.match(
-            "Unable to parse subject_token from JSON file '{}' using key '{}'".format(
-                str(invalid_json_file), "access_token"
-            )
-        )
+        assert _unparseable_subject_token_pattern(
+            str(invalid_json_file), "access_token"
+        ).search(str(excinfo.value))
 
     def test_retrieve_subject_token_file_not_found(self):
         credential_source = {"file": "./not_found.txt"}
@@ -528,155 +657,51 @@ class TestCredentials(object):
         with pytest.raises(exceptions.RefreshError) as excinfo:
             credentials.retrieve_subject_token(None)
 
-        assert excinfo.match(r"File './not_found.txt' was not found")
-
-    def test_refresh_text_file_success_without_impersonation_ignore_default_scopes(
-        self,
-    ):
-        credentials = self.make_credentials(
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET,
-            # Test with text format type.
-            credential_source=self.CREDENTIAL_SOURCE_TEXT,
-            scopes=SCOPES,
-            # Default scopes should be ignored.
-            default_scopes=["ignored"],
-        )
-
-        self.assert_underlying_credentials_refresh(
-            credentials=credentials,
-            audience=AUDIENCE,
-            subject_token=TEXT_FILE_SUBJECT_TOKEN,
-            subject_token_type=SUBJECT_TOKEN_TYPE,
-            token_url=TOKEN_URL,
-            service_account_impersonation_url=None,
-            basic_auth_encoding=BASIC_AUTH_ENCODING,
-            quota_project_id=None,
-            used_scopes=SCOPES,
-            scopes=SCOPES,
-            default_scopes=["ignored"],
-        )
-
-    def test_refresh_text_file_success_without_impersonation_use_default_scopes(self):
-        credentials = self.make_credentials(
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET,
-            # Test with text format type.
-            credential_source=self.CREDENTIAL_SOURCE_TEXT,
-            scopes=None,
-            # Default scopes should be used since user specified scopes are none.
-            default_scopes=SCOPES,
-        )
-
-        self.assert_underlying_credentials_refresh(
-            credentials=credentials,
-            audience=AUDIENCE,
-            subject_token=TEXT_FILE_SUBJECT_TOKEN,
-            subject_token_type=SUBJECT_TOKEN_TYPE,
-            token_url=TOKEN_URL,
-            service_account_impersonation_url=None,
-            basic_auth_encoding=BASIC_AUTH_ENCODING,
-            quota_project_id=None,
-            used_scopes=SCOPES,
-            scopes=None,
-            default_scopes=SCOPES,
-        )
-
-    def test_refresh_text_file_success_with_impersonation_ignore_default_scopes(self):
-        # Initialize credentials with service account impersonation and basic auth.
-        credentials = self.make_credentials(
-            # Test with text format type.
-            credential_source=self.CREDENTIAL_SOURCE_TEXT,
-            service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
-            scopes=SCOPES,
-            # Default scopes should be ignored.
-            default_scopes=["ignored"],
-        )
-
-        self.assert_underlying_credentials_refresh(
-            credentials=credentials,
-            audience=AUDIENCE,
-            subject_token=TEXT_FILE_SUBJECT_TOKEN,
-            subject_token_type=SUBJECT_TOKEN_TYPE,
-            token_url=TOKEN_URL,
-            service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
-            basic_auth_encoding=None,
-            quota_project_id=None,
-            used_scopes=SCOPES,
-            scopes=SCOPES,
-            default_scopes=["ignored"],
-        )
-
-    def test_refresh_text_file_success_with_impersonation_use_default_scopes(self):
-        # Initialize credentials with service account impersonation, basic auth
-        # and default scopes (no user scopes).
-        credentials = self.make_credentials(
-            # Test with text format type.
-            credential_source=self.CREDENTIAL_SOURCE_TEXT,
-            service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
-            scopes=None,
-            # Default scopes should be used since user specified scopes are none.
-            default_scopes=SCOPES,
-        )
-
-        self.assert_underlying_credentials_refresh(
-            credentials=credentials,
-            audience=AUDIENCE,
-            subject_token=TEXT_FILE_SUBJECT_TOKEN,
-            subject_token_type=SUBJECT_TOKEN_TYPE,
-            token_url=TOKEN_URL,
-            service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
-            basic_auth_encoding=None,
-            quota_project_id=None,
-            used_scopes=SCOPES,
-            scopes=None,
-            default_scopes=SCOPES,
-        )
-
-    def test_refresh_json_file_success_without_impersonation(self):
-        credentials = self.make_credentials(
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET,
-            # Test with JSON format type.
-            credential_source=self.CREDENTIAL_SOURCE_JSON,
-            scopes=SCOPES,
-        )
-
-        self.assert_underlying_credentials_refresh(
-            credentials=credentials,
-            audience=AUDIENCE,
-            subject_token=JSON_FILE_SUBJECT_TOKEN,
-            subject_token_type=SUBJECT_TOKEN_TYPE,
-            token_url=TOKEN_URL,
-            service_account_impersonation_url=None,
-            basic_auth_encoding=BASIC_AUTH_ENCODING,
-            quota_project_id=None,
-            used_scopes=SCOPES,
-            scopes=SCOPES,
-            default_scopes=None,
-        )
+        assert _FILE_NOT_FOUND_PATTERN.search(str(excinfo.value))
 
-    def test_refresh_json_file_success_with_impersonation(self):
-        # Initialize credentials with service account impersonation and basic auth.
+    @pytest.mark.parametrize(
+        "fmt,impersonate,use_default_scopes",
+        list(itertools.product(["text", "json"], [False, True], [False, True])),
+    )
+    def test_refresh_file_success(self, fmt, impersonate, use_default_scopes):
+        credential_source = {
+            "text": self.CREDENTIAL_SOURCE_TEXT,
+            "json": self.CREDENTIAL_SOURCE_JSON,
+        }[fmt]
+        subject_token = {
+            "text": _text_file_subject_token(),
+            "json": _json_file_subject_token(),
+        }[fmt]
+        # When user scopes are specified, default scopes should be ignored;
+        # otherwise default scopes should be used.
+        scopes = None if use_default_scopes else SCOPES
+        default_scopes = SCOPES if use_default_scopes else ["ignored"]
+        # Basic auth is exercised on the non-impersonated variants.
         credentials = self.make_credentials(
-            # Test with JSON format type.
-            credential_source=self.CREDENTIAL_SOURCE_JSON,
-            service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
-            scopes=SCOPES,
+            client_id=None if impersonate else CLIENT_ID,
+            client_secret=None if impersonate else CLIENT_SECRET,
+            credential_source=credential_source,
+            service_account_impersonation_url=(
+                SERVICE_ACCOUNT_IMPERSONATION_URL if impersonate else None
+            ),
+            scopes=scopes,
+            default_scopes=default_scopes,
         )
 
         self.assert_underlying_credentials_refresh(
             credentials=credentials,
             audience=AUDIENCE,
-            subject_token=JSON_FILE_SUBJECT_TOKEN,
+            subject_token=subject_token,
             subject_token_type=SUBJECT_TOKEN_TYPE,
             token_url=TOKEN_URL,
-            service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
-            basic_auth_encoding=None,
+            service_account_impersonation_url=(
+                SERVICE_ACCOUNT_IMPERSONATION_URL if impersonate else None
+            ),
+            basic_auth_encoding=None if impersonate else BASIC_AUTH_ENCODING,
             quota_project_id=None,
             used_scopes=SCOPES,
-            scopes=SCOPES,
-            default_scopes=None,
+            scopes=scopes,
+            default_scopes=default_scopes,
         )
 
     def test_refresh_with_retrieve_subject_token_error(self):
@@ -689,42 +714,38 @@ class TestCredentials(object):
         with pytest.raises(exceptions.RefreshError) as excinfo:
             credentials.refresh(None)
 
-        assert excinfo.match(
-            "Unable to parse subject_token from JSON file '{}' using key '{}'".format(
-                SUBJECT_TOKEN_JSON_FILE, "not_found"
-            )
-        )
+        assert _JSON_FILE_MISSING_KEY_PATTERN.search(str(excinfo.value))
 
-    def test_retrieve_subject_token_from_url(self):
-        credentials = self.make_credentials(
+    def test_retrieve_subject_token_from_url(self, credentials_factory):
+        credentials = credentials_factory(
             credential_source=self.CREDENTIAL_SOURCE_TEXT_URL
         )
-        request = self.make_mock_request(token_data=TEXT_FILE_SUBJECT_TOKEN)
+        request = self.make_mock_request(token_data=_text_file_subject_token())
         subject_token = credentials.retrieve_subject_token(request)
 
-        assert subject_token == TEXT_FILE_SUBJECT_TOKEN
+        assert subject_token == _text_file_subject_token()
         self.assert_credential_request_kwargs(request.call_args_list[0][1], None)
 
     def test_retrieve_subject_token_from_url_with_headers(self):
         credentials = self.make_credentials(
             credential_source={"url": self.CREDENTIAL_URL, "headers": {"foo": "bar"}}
         )
-        request = self.make_mock_request(token_data=TEXT_FILE_SUBJECT_TOKEN)
+        request = self.make_mock_request(token_data=_text_file_subject_token())
         subject_token = credentials.retrieve_subject_token(request)
 
-        assert subject_token == TEXT_FILE_SUBJECT_TOKEN
+        assert subject_token == _text_file_subject_token()
         self.assert_credential_request_kwargs(
             request.call_args_list[0][1], {"foo": "bar"}
         )
 
-    def test_retrieve_subject_token_from_url_json(self):
-        credentials = self.make_credentials(
+    def test_retrieve_subject_token_from_url_json(self, credentials_factory):
+        credentials = credentials_factory(
             credential_source=self.CREDENTIAL_SOURCE_JSON_URL
         )
-        request = self.make_mock_request(token_data=JSON_FILE_CONTENT)
+        request = self.make_mock_request(token_data=_json_file_content())
         subject_token = credentials.retrieve_subject_token(request)
 
-        assert subject_token == JSON_FILE_SUBJECT_TOKEN
+        assert subject_token == _json_file_subject_token()
         self.assert_credential_request_kwargs(request.call_args_list[0][1], None)
 
     def test_retrieve_subject_token_from_url_json_with_headers(self):
@@ -735,24 +756,26 @@ class TestCredentials(object):
                 "headers": {"foo": "bar"},
             }
         )
-        request = self.make_mock_request(token_data=JSON_FILE_CONTENT)
+        request = self.make_mock_request(token_data=_json_file_content())
         subject_token = credentials.retrieve_subject_token(request)
 
-        assert subject_token == JSON_FILE_SUBJECT_TOKEN
+        assert subject_token == _json_file_subject_token()
         self.assert_credential_request_kwargs(
             request.call_args_list[0][1], {"foo": "bar"}
         )
 
-    def test_retrieve_subject_token_from_url_not_found(self):
-        credentials = self.make_credentials(
+    def test_retrieve_subject_token_from_url_not_found(self, credentials_factory):
+        credentials = credentials_factory(
             credential_source=self.CREDENTIAL_SOURCE_TEXT_URL
         )
         with pytest.raises(exceptions.RefreshError) as excinfo:
             credentials.retrieve_subject_token(
-                self.make_mock_request(token_status=404, token_data=JSON_FILE_CONTENT)
+                self.make_mock_request(
+                    token_status=404, token_data=_json_file_content()
+                )
             )
 
-        assert excinfo.match("Unable to retrieve Identity Pool subject token")
+        assert _RETRIEVAL_ERROR_PATTERN.search(str(excinfo.value))
 
     def test_retrieve_subject_token_from_url_json_invalid_field(self):
         credential_source = {
@@ -763,31 +786,27 @@ class TestCredentials(object):
 
         with pytest.raises(exceptions.RefreshError) as excinfo:
             credentials.retrieve_subject_token(
-                self.make_mock_request(token_data=JSON_FILE_CONTENT)
+                self.make_mock_request(token_data=_json_file_content())
             )
 
-        assert excinfo.match(
-            "Unable to parse subject_token from JSON file '{}' using key '{}'".format(
-                self.CREDENTIAL_URL, "not_found"
-            )
-        )
+        assert self.URL_MISSING_KEY_PATTERN.search(str(excinfo.value))
 
-    def test_retrieve_subject_token_from_url_json_invalid_format(self):
-        credentials = self.make_credentials(
+    def test_retrieve_subject_token_from_url_json_invalid_format(
+        self, credentials_factory, mock_request_invalid_json
+    ):
+        credentials = credentials_factory(
             credential_source=self.CREDENTIAL_SOURCE_JSON_URL
         )
 
         with pytest.raises(exceptions.RefreshError) as excinfo:
-            credentials.retrieve_subject_token(self.make_mock_request(token_data="{"))
+            credentials.retrieve_subject_token(mock_request_invalid_json)
 
-        assert excinfo.match(
-            "Unable to parse subject_token from JSON file '{}' using key '{}'".format(
-                self.CREDENTIAL_URL, "access_token"
-            )
-        )
+        assert self.URL_INVALID_CONTENT_PATTERN.search(str(excinfo.value))
 
-    def test_refresh_text_file_success_without_impersonation_url(self):
-        credentials = self.make_credentials(
+    def test_refresh_text_file_success_without_impersonation_url(
+        self, credentials_factory
+    ):
+        credentials = credentials_factory(
             client_id=CLIENT_ID,
             client_secret=CLIENT_SECRET,
             # Test with text format type.
@@ -798,7 +817,7 @@ class TestCredentials(object):
         self.assert_underlying_credentials_refresh(
             credentials=credentials,
             audience=AUDIENCE,
-            subject_token=TEXT_FILE_SUBJECT_TOKEN,
+            subject_token=_text_file_subject_token(),
             subject_token_type=SUBJECT_TOKEN_TYPE,
             token_url=TOKEN_URL,
             service_account_impersonation_url=None,
@@ -807,12 +826,14 @@ class TestCredentials(object):
             used_scopes=SCOPES,
             scopes=SCOPES,
             default_scopes=None,
-            credential_data=TEXT_FILE_SUBJECT_TOKEN,
+            credential_data=_text_file_subject_token(),
         )
 
-    def test_refresh_text_file_success_with_impersonation_url(self):
+    def test_refresh_text_file_success_with_impersonation_url(
+        self, credentials_factory
+    ):
         # Initialize credentials with service account impersonation and basic auth.
-        credentials = self.make_credentials(
+        credentials = credentials_factory(
             # Test with text format type.
             credential_source=self.CREDENTIAL_SOURCE_TEXT_URL,
             service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
@@ -822,7 +843,7 @@ class TestCredentials(object):
         self.assert_underlying_credentials_refresh(
             credentials=credentials,
             audience=AUDIENCE,
-            subject_token=TEXT_FILE_SUBJECT_TOKEN,
+            subject_token=_text_file_subject_token(),
             subject_token_type=SUBJECT_TOKEN_TYPE,
             token_url=TOKEN_URL,
             service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
@@ -831,11 +852,13 @@ class TestCredentials(object):
             used_scopes=SCOPES,
             scopes=SCOPES,
             default_scopes=None,
-            credential_data=TEXT_FILE_SUBJECT_TOKEN,
+            credential_data=_text_file_subject_token(),
         )
 
-    def test_refresh_json_file_success_without_impersonation_url(self):
-        credentials = self.make_credentials(
+    def test_refresh_json_file_success_without_impersonation_url(
+        self, credentials_factory
+    ):
+        credentials = credentials_factory(
             client_id=CLIENT_ID,
             client_secret=CLIENT_SECRET,
             # Test with JSON format type.
@@ -846,7 +869,7 @@ class TestCredentials(object):
         self.assert_underlying_credentials_refresh(
             credentials=credentials,
             audience=AUDIENCE,
-            subject_token=JSON_FILE_SUBJECT_TOKEN,
+            subject_token=_json_file_subject_token(),
             subject_token_type=SUBJECT_TOKEN_TYPE,
             token_url=TOKEN_URL,
             service_account_impersonation_url=None,
@@ -855,12 +878,14 @@ class TestCredentials(object):
             used_scopes=SCOPES,
             scopes=SCOPES,
             default_scopes=None,
-            credential_data=JSON_FILE_CONTENT,
+            credential_data=_json_file_content(),
         )
 
-    def test_refresh_json_file_success_with_impersonation_url(self):
+    def test_refresh_json_file_success_with_impersonation_url(
+        self, credentials_factory
+    ):
         # Initialize credentials with service account impersonation and basic auth.
-        credentials = self.make_credentials(
+        credentials = credentials_factory(
             # Test with JSON format type.
             credential_source=self.CREDENTIAL_SOURCE_JSON_URL,
             service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
@@ -870,7 +895,7 @@ class TestCredentials(object):
         self.assert_underlying_credentials_refresh(
             credentials=credentials,
             audience=AUDIENCE,
-            subject_token=JSON_FILE_SUBJECT_TOKEN,
+            subject_token=_json_file_subject_token(),
             subject_token_type=SUBJECT_TOKEN_TYPE,
             token_url=TOKEN_URL,
             service_account_impersonation_url=SERVICE_ACCOUNT_IMPERSONATION_URL,
@@ -879,21 +904,19 @@ class TestCredentials(object):
             used_scopes=SCOPES,
             scopes=SCOPES,
             default_scopes=None,
-            credential_data=JSON_FILE_CONTENT,
+            credential_data=_json_file_content(),
         )
 
-    def test_refresh_with_retrieve_subject_token_error_url(self):
+    def test_refresh_with_retrieve_subject_token_error_url(
+        self, credentials_factory, mock_request_json_content
+    ):
         credential_source = {
             "url": self.CREDENTIAL_URL,
             "format": {"type": "json", "subject_token_field_name": "not_found"},
         }
-        credentials = self.make_credentials(credential_source=credential_source)
+        credentials = credentials_factory(credential_source=credential_source)
 
         with pytest.raises(exceptions.RefreshError) as excinfo:
-            credentials.refresh(self.make_mock_request(token_data=JSON_FILE_CONTENT))
+            credentials.refresh(mock_request_json_content)
 
-        assert excinfo.match(
-            "Unable to parse subject_token from JSON file '{}' using key '{}'".format(
-                self.CREDENTIAL_URL, "not_found"
-            )
-        )
+        assert self.URL_MISSING_KEY_PATTERN.search(str(excinfo.value))
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import base64
+import copy
 import datetime
 import json
 import os
@@ -49,7 +50,9 @@ with open(SERVICE_ACCOUNT_JSON_FILE, "r") as fh:
     SERVICE_ACCOUNT_INFO = json.load(fh)
 
 
-@pytest.fixture
+# The signer fixtures are module-scoped because key parsing is relatively
+# expensive and the signers are never mutated by the tests.
+@pytest.fixture(scope="module")
 def signer():
     return crypt.RSASigner.from_string(PRIVATE_KEY_BYTES, "1")
 
@@ -79,7 +82,7 @@ def test_encode_custom_alg_in_headers(signer):
     assert header == {"typ": "JWT", "alg": "foo", "kid": signer.key_id}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def es256_signer():
     return crypt.ES256Signer.from_string(EC_PRIVATE_KEY_BYTES, "1")
 
@@ -105,16 +108,17 @@ def token_factory(signer, es256_signer):
         }
         payload.update(claims or {})
 
+        signing_signer = es256_signer if use_es256_signer else signer
+
         # False is specified to remove the signer's key id for testing
-        # headers without key ids.
+        # headers without key ids. Sign with a key id-less copy rather
+        # than mutating the shared module-scoped signer.
         if key_id is False:
-            signer._key_id = None
+            signing_signer = copy.copy(signing_signer)
+            signing_signer._key_id = None
             key_id = None
 
-        if use_es256_signer:
-            return jwt.encode(es256_signer, payload, key_id=key_id)
-        else:
-            return jwt.encode(signer, payload, key_id=key_id)
+        return jwt.encode(signing_signer, payload, key_id=key_id)
 
     return factory
 
@@ -13,11 +13,8 @@
 # limitations under the License.
 
 import http.client
-import time
 
-import flask
 import pytest
-from pytest_localserver.http import WSGIServer
 
 from google.auth import exceptions
 
@@ -26,40 +23,9 @@ NXDOMAIN = "test.invalid"
 
 
 class RequestResponseTests(object):
-    @pytest.fixture(scope="module")
-    def server(self):
-        """Provides a test HTTP server.
-
-        The test server is automatically created before
-        a test and destroyed at the end. The server is serving a test
-        application that can be used to verify requests.
-        """
-        app = flask.Flask(__name__)
-        app.debug = True
-
-        # pylint: disable=unused-variable
-        # (pylint thinks the flask routes are unusued.)
-        @app.route("/basic")
-        def index():
-            header_value = flask.request.headers.get("x-test-header", "value")
-            headers = {"X-Test-Header": header_value}
-            return "Basic Content", http.client.OK, headers
-
-        @app.route("/server_error")
-        def server_error():
-            return "Error", http.client.INTERNAL_SERVER_ERROR
-
-        @app.route("/wait")
-        def wait():
-            time.sleep(3)
-            return "Waited"
-
-        # pylint: enable=unused-variable
-
-        server = WSGIServer(application=app.wsgi_app)
-        server.start()
-        yield server
-        server.stop()
+    # The `server` fixture is provided by the transport conftest.py as a
+    # session-scoped fixture so the Flask app and WSGI server are only
+    # built once per run.
 
     def test_request_basic(self, server):
         request = self.make_request()
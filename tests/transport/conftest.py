@@ -0,0 +1,57 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+import time
+
+import flask
+import pytest
+from pytest_localserver.http import WSGIServer
+
+
+@pytest.fixture(scope="session")
+def server():
+    """Provides a test HTTP server.
+
+    The test server is created once per session and destroyed at the end.
+    The server is serving a test application that can be used to verify
+    requests. The served routes are read-only, so sharing the server
+    across tests is safe.
+    """
+    app = flask.Flask(__name__)
+    app.debug = True
+
+    # pylint: disable=unused-variable
+    # (pylint thinks the flask routes are unusued.)
+    @app.route("/basic")
+    def index():
+        header_value = flask.request.headers.get("x-test-header", "value")
+        headers = {"X-Test-Header": header_value}
+        return "Basic Content", http.client.OK, headers
+
+    @app.route("/server_error")
+    def server_error():
+        return "Error", http.client.INTERNAL_SERVER_ERROR
+
+    @app.route("/wait")
+    def wait():
+        time.sleep(3)
+        return "Waited"
+
+    # pylint: enable=unused-variable
+
+    server = WSGIServer(application=app.wsgi_app)
+    server.start()
+    yield server
+    server.stop()
@@ -24,7 +24,7 @@ from google.auth import exceptions
 from tests import test_jwt
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def signer():
     return crypt.RSASigner.from_string(test_jwt.PRIVATE_KEY_BYTES, "1")
 